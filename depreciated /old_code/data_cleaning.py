@@ -1,9 +1,39 @@
-
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 from pathlib import Path
 import numpy as np
 import argparse
 
 
+# Lap columns kept in the combined output ('Time' was the index column in the original read and never kept)
+LAP_COLUMNS = [
+    'Driver', 'DriverNumber', 'LapTime', 'LapNumber', 'Stint',
+    'Sector1Time', 'Sector2Time', 'Sector3Time',
+    'Sector1SessionTime', 'Sector2SessionTime', 'Sector3SessionTime',
+    'SpeedI1', 'SpeedI2', 'SpeedFL', 'SpeedST', 'IsPersonalBest',
+    'Compound', 'TyreLife', 'FreshTyre', 'Team', 'LapStartTime',
+    'TrackStatus', 'QualifyingPosition', 'Year', 'EventName', 'WetSession'
+]
+# Column types for the CSV reader, skips type inference
+SCHEMA = {
+    'Driver': pa.string(), 'DriverNumber': pa.int16(),
+    'LapTime': pa.string(), 'LapNumber': pa.float32(), 'Stint': pa.float32(),
+    'Sector1Time': pa.string(), 'Sector2Time': pa.string(), 'Sector3Time': pa.string(),
+    'Sector1SessionTime': pa.string(), 'Sector2SessionTime': pa.string(),
+    'Sector3SessionTime': pa.string(),
+    'SpeedI1': pa.float32(), 'SpeedI2': pa.float32(), 'SpeedFL': pa.float32(),
+    'SpeedST': pa.float32(), 'IsPersonalBest': pa.bool_(), 'Compound': pa.string(),
+    'TyreLife': pa.float32(), 'FreshTyre': pa.bool_(), 'Team': pa.string(),
+    'LapStartTime': pa.string(), 'TrackStatus': pa.int32(), 'Year': pa.int16(),
+    'EventName': pa.string(), 'QualifyingPosition': pa.float32(), 'WetSession': pa.bool_(),
+    'Deleted': pa.bool_(), 'IsAccurate': pa.bool_()
+}
+# Low-cardinality text columns stored as categoricals
+CATEGORY_COLUMNS = ['Driver', 'EventName', 'Team', 'Compound']
+
 
 class F1DataCleaner:
     def __init__(self, input_dir='data/original_data', output_dir='data'):
@@ -21,60 +51,54 @@ class F1DataCleaner:
         
         
     def combine_data(self):
-        dfs = []
-
-        for file in self.input_dir.glob('*.csv'):
-            orig_df = pd.read_csv(file, index_col = 0)
-            print(f"Reading {file.name}")
-            cleaned_df = orig_df[(orig_df['Deleted'] == False) & #lap not deleted
-                       # (orig_df['TrackStatus'] == 1) & #normal conditions
-                        (orig_df['IsAccurate'] == True)] #actual data
-            cleaned_df = cleaned_df.dropna(axis=1, how='all') #remove empty columns 
-            cleaned_df = cleaned_df.drop(columns = ['IsAccurate', 'FastF1Generated', 
-                                             'Deleted', 'LapStartDate']) #remove not needed columns
-            dfs.append(cleaned_df)
-
-        combined = pd.concat(dfs, ignore_index = True)
-        combined = combined.rename(columns = {'Time': 'LapCompletionTime'}) 
-
-        combined = combined.sort_values(by=['Year', 'EventName', 'Driver', 'LapNumber'])
+        files = sorted(self.input_dir.glob('*.csv'))
+        print(f"Reading {len(files)} files from {self.input_dir}")
+
+        # one child dataset per season so the schema is unified across files,
+        # columns missing from older seasons come back as nulls
+        csv_format = ds.CsvFileFormat(convert_options=pv.ConvertOptions(column_types=SCHEMA,
+                                                                        strings_can_be_null=True))
+        dataset = ds.dataset([ds.dataset(str(file), format=csv_format) for file in files])
+
+        # filter while scanning so deleted/inaccurate laps are never materialized
+        lap_filter = ((ds.field('Deleted') == False) & #lap not deleted
+                      # (ds.field('TrackStatus') == 1) & #normal conditions
+                      (ds.field('IsAccurate') == True)) #actual data
+        table = dataset.to_table(columns=LAP_COLUMNS, filter=lap_filter)
+
+        combined = table.to_pandas(types_mapper=pd.ArrowDtype)
+        # few distinct values repeated on every lap, store them as integer codes
+        for col in CATEGORY_COLUMNS:
+            combined[col] = combined[col].astype('category')
+
+        # sort by Year, EventName, Driver, LapNumber (lexsort takes the primary key last),
+        # comparing category codes instead of strings
+        order = np.lexsort((combined['LapNumber'].to_numpy(dtype='float64', na_value=np.nan),
+                            combined['Driver'].cat.codes.to_numpy(),
+                            combined['EventName'].cat.codes.to_numpy(),
+                            combined['Year'].to_numpy(dtype='int64')))
+        combined = combined.take(order)
 
         return combined
     
     def change_time_format(self, df):
         
-        time_columns = [
-            'LapCompletionTime', 'LapTime', 'Sector1Time', 'Sector2Time', 'Sector3Time', 
-            'LapStartTime', 'Sector1SessionTime', 'Sector2SessionTime', 'Sector3SessionTime'
-            ]
-        for col in time_columns:
-            if col in df.columns:  # Check if column exists
-                if df[col].dtype == 'object':  # Check if column contains strings
-                    df[col] = df[col].str.replace('0 days ', '')
-
         lap_columns = ['LapTime']
         sector_columns = ['Sector1Time', 'Sector2Time', 'Sector3Time']
         session_columns = ['LapStartTime', 'LapCompletionTime', 'Sector1SessionTime', 'Sector2SessionTime', 'Sector3SessionTime']
 
-        for col in lap_columns:
+        # to_timedelta reads the '0 days HH:MM:SS.ffffff' strings as they are, no need to strip them first
+        for col in lap_columns + sector_columns:
             if col in df.columns: #check to make sure exists and there we no issues in data collection
-                df[col] = pd.to_timedelta(df[col]).dt.total_seconds().round(3)
-                # Convert to MM:SS.mmm format
-                df[col] = df[col].apply(lambda x: f"{int(x//60):01d}:{x%60:06.3f}" if pd.notnull(x) else None)
-
-        for col in sector_columns:
-            if col in df.columns:
-                df[col] = pd.to_timedelta(df[col]).dt.total_seconds().round(3)
-                # Convert to SS.mmm format
-                df[col] = df[col].apply(lambda x: f"{x:06.3f}" if pd.notnull(x) else None)
+                # Keep as numeric seconds, formatting is left to the writer
+                df[col] = pd.to_timedelta(df[col], errors='coerce').dt.total_seconds().round(3).astype('float32')
                 new_col_name = f"{col} (s)"
                 df = df.rename(columns={col: new_col_name})
 
         for col in session_columns:
             if col in df.columns:
-                # Keep these as timestamps for ordering laps in session 
-                df[col] = pd.to_datetime(df[col], format='mixed')
-                df[col] = df[col].dt.time #only show time, not date 
+                # Keep these as time since session start for ordering laps in session 
+                df[col] = pd.to_timedelta(df[col], errors='coerce')
         
         speed_columns = ['SpeedI1', 'SpeedI2', 'SpeedFL', 'SpeedST']
 
@@ -95,13 +119,15 @@ class F1DataCleaner:
         """
         try:
             combined_data = self.combine_data()
-            earliest_year = sorted(combined_data['Year'].unique())[0]
-            latest_year = sorted(combined_data['Year'].unique())[-1]
+            earliest_year = int(combined_data['Year'].min())
+            latest_year = int(combined_data['Year'].max())
 
-            output_file = self.output_dir / f'quali_data_{earliest_year}_to_{latest_year}.csv'
+            output_file = self.output_dir / f'quali_data_{earliest_year}_to_{latest_year}.parquet'
             #cleaned_combined_data = self.change_time_format(combined_data)
-            #cleaned_combined_data.to_csv(output_file, index = False) ##check this 
-            combined_data.to_csv(output_file, index = False)
+            # columns are already Arrow-backed, so this hands the buffers straight to Arrow's writer
+            table = pa.Table.from_pandas(combined_data, preserve_index=False)
+            # dictionary encoding collapses the repeated Driver/Team/EventName strings
+            pq.write_table(table, output_file, compression='zstd', use_dictionary=True)
             return {'success': True, 'message': f"Data saved to {output_file}"}
         except Exception as e:
             return {'success': False, 'message': f"Failed to clean data: {str(e)}"}
@@ -1,10 +1,35 @@
 import pandas as pd
 import fastf1
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import os
 import numpy as np
 import argparse
 
 
+# Lap columns kept in the combined output
+KEEP_COLUMNS = [
+    'Driver', 'DriverNumber', 'LapTime', 'LapNumber', 'Stint',
+    'Sector1Time', 'Sector2Time', 'Sector3Time',
+    'Sector1SessionTime', 'Sector2SessionTime', 'Sector3SessionTime',
+    'SpeedI1', 'SpeedI2', 'SpeedFL', 'SpeedST', 'IsPersonalBest',
+    'Compound', 'TyreLife', 'FreshTyre', 'Team', 'LapStartTime',
+    'TrackStatus', 'Year', 'EventName', 'QualifyingPosition', 'WetSession'
+]
+# Only needed to filter laps, dropped before output
+FILTER_COLUMNS = ['Deleted', 'IsAccurate']
+# Column dtypes for read_csv, skips type inference
+SCHEMA = {
+    'Driver': str, 'DriverNumber': 'int16', 'LapTime': str, 'LapNumber': 'float32',
+    'Stint': 'float32', 'Sector1Time': str, 'Sector2Time': str, 'Sector3Time': str,
+    'Sector1SessionTime': str, 'Sector2SessionTime': str, 'Sector3SessionTime': str,
+    'SpeedI1': 'float32', 'SpeedI2': 'float32', 'SpeedFL': 'float32', 'SpeedST': 'float32',
+    'IsPersonalBest': 'boolean', 'Compound': str, 'TyreLife': 'float32',
+    'FreshTyre': 'boolean', 'Team': str, 'LapStartTime': str, 'TrackStatus': 'float32',
+    'Year': 'int16', 'EventName': str, 'QualifyingPosition': 'float32',
+    'WetSession': 'boolean', 'Deleted': 'bool', 'IsAccurate': 'bool'
+}
+
 
 class F1DataCleaner:
     def __init__(self, input_dir='data/original_data', output_dir='data'):
@@ -21,19 +46,23 @@ class F1DataCleaner:
         self.output_dir = Path(output_dir)
         
         
+    def _read_file(self, file):
+        # only parse the columns we keep (some are missing in older seasons) plus the filter flags
+        orig_df = pd.read_csv(file, usecols=lambda col: col in KEEP_COLUMNS + FILTER_COLUMNS,
+                              dtype=SCHEMA, engine='c', low_memory=False)
+        print(f"Reading {file.name}")
+        # build the mask on the raw arrays to skip pandas index alignment
+        mask = np.logical_and.reduce([orig_df['Deleted'].to_numpy() == False, #lap not deleted
+                                      # orig_df['TrackStatus'].to_numpy() == 1, #normal conditions
+                                      orig_df['IsAccurate'].to_numpy() == True]) #actual data
+        cleaned_df = orig_df.iloc[mask]
+        cleaned_df = cleaned_df.drop(columns = FILTER_COLUMNS) #only needed for filtering
+        return cleaned_df
+
     def combine_data(self):
-        dfs = []
-
-        for file in self.input_dir.glob('*.csv'):
-            orig_df = pd.read_csv(file, index_col = 0)
-            print(f"Reading {file.name}")
-            cleaned_df = orig_df[(orig_df['Deleted'] == False) & #lap not deleted
-                       # (orig_df['TrackStatus'] == 1) & #normal conditions
-                        (orig_df['IsAccurate'] == True)] #actual data
-            cleaned_df = cleaned_df.dropna(axis=1, how='all') #remove empty columns 
-            cleaned_df = cleaned_df.drop(columns = ['IsAccurate', 'FastF1Generated', 
-                                             'Deleted', 'LapStartDate']) #remove not needed columns
-            dfs.append(cleaned_df)
+        # the C parser releases the GIL, so files are parsed in parallel threads
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            dfs = list(executor.map(self._read_file, self.input_dir.glob('*.csv')))
 
         combined = pd.concat(dfs, ignore_index = True)
         combined = combined.rename(columns = {'Time': 'LapCompletionTime'}) 
@@ -96,13 +125,15 @@ class F1DataCleaner:
         """
         try:
             combined_data = self.combine_data()
-            earliest_year = sorted(combined_data['Year'].unique())[0]
-            latest_year = sorted(combined_data['Year'].unique())[-1]
+            earliest_year = int(combined_data['Year'].min())
+            latest_year = int(combined_data['Year'].max())
 
             output_file = self.output_dir / f'quali_data_{earliest_year}_to_{latest_year}.csv'
             #cleaned_combined_data = self.change_time_format(combined_data)
             #cleaned_combined_data.to_csv(output_file, index = False) ##check this 
-            combined_data.to_csv(output_file, index = False)
+            # large write buffer and chunked formatting for the combined file
+            with open(output_file, 'w', buffering=1 << 22, newline='') as f:
+                combined_data.to_csv(f, index = False, chunksize=100_000)
             return {'success': True, 'message': f"Data saved to {output_file}"}
         except Exception as e:
             return {'success': False, 'message': f"Failed to clean data: {str(e)}"}
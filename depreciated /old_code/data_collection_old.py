@@ -1,5 +1,6 @@
 import fastf1
 import pandas as pd
+import numpy as np
 import logging
 import time
 from pathlib import Path
@@ -131,12 +132,13 @@ class F1DataFetcher:
         """Process all events for a given year."""
         yearly_data = []
     
-        for _, event in schedule.iterrows():
+        for event_name in schedule['EventName'].tolist():
             try:
                 time.sleep(2)  # attempt at rate limiting 
         
-                session = fastf1.get_session(year, event['EventName'], 'Q')
-                session.load()
+                session = fastf1.get_session(year, event_name, 'Q')
+                # laps, weather and messages (used for the Deleted flag) are needed, telemetry is not
+                session.load(telemetry=False)
         
                 laps = session.laps #df of all quali laps in that session 
                 weather_data = session.weather_data
@@ -147,44 +149,31 @@ class F1DataFetcher:
                 is_wet = False
 
                 if weather_data is not None and 'Rainfall' in weather_data.columns:
-                    # Get the time range of session
-                    session_start = laps['Time'].min()
-                    session_end = laps['Time'].max()
+                    # weather_data is already limited to the session, no need to slice by lap times
+                    rainfall = weather_data['Rainfall'].to_numpy()
                     
-                    # Filter weather data to only include readings during the session
-                    session_weather = weather_data[
-                        (weather_data['Time'] >= session_start) & 
-                        (weather_data['Time'] <= session_end)
-                    ]
-                    
-                    # Calculate the percentage of weather readings that showed rainfall
-                    if not session_weather.empty:
-                        rain_percentage = session_weather['Rainfall'].mean() #proportion of True
-                        is_wet = rain_percentage > 0.5  # True if more than 50% of session had rain
+                    # True if more than 50% of the readings had rain
+                    is_wet = np.count_nonzero(rainfall) > 0.5 * rainfall.size
                        
 
                 #map driver, number, position to laps df 
-                driver_info = {}
-                for _, driver in session.results.iterrows():  
-                    driver_number = driver['DriverNumber']
-                    driver_info[driver_number] = {
-                        'BroadcastName': driver['BroadcastName'],
-                        'Position': driver['Position'], # Add quali position
-                    }
+                results = session.results
+                name_map = dict(zip(results['DriverNumber'], results['BroadcastName']))
+                position_map = dict(zip(results['DriverNumber'], results['Position'])) # quali position
             
-                laps['Driver'] = laps['DriverNumber'].map(lambda x: driver_info[x]['BroadcastName']) #gets corresponding name for every number and saves as Driver
-                laps['QualifyingPosition'] = laps['DriverNumber'].map(lambda x: driver_info[x]['Position'])
+                laps['Driver'] = laps['DriverNumber'].map(name_map) #gets corresponding name for every number and saves as Driver
+                laps['QualifyingPosition'] = laps['DriverNumber'].map(position_map)
 
                 
                 laps['Year'] = year
-                laps['EventName'] = event['EventName']
+                laps['EventName'] = event_name
                 laps['WetSession'] = is_wet
         
                 yearly_data.append(laps)
 
             except Exception as e:
                 self.logger.error(
-                    f"Error loading {event['EventName']} {year}: {str(e)}"
+                    f"Error loading {event_name} {year}: {str(e)}"
                 )
 
         return yearly_data
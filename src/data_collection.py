@@ -1,5 +1,6 @@
 import fastf1
 import pandas as pd
+import numpy as np
 import logging
 import time
 from pathlib import Path
@@ -8,13 +9,23 @@ from tqdm import tqdm
 import argparse
 import gc
 import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 
+# Minimum seconds between session requests, shared by all worker processes
+REQUEST_INTERVAL = 5
+
+# Rate limiter state, set in each worker by _init_worker; left as None outside the process pool
+_rate_lock = None
+_last_request = None
+
 
 class F1DataFetcher:
     def __init__(self, cache_dir: str = 'f1_cache', 
                  output_dir: str = 'f1_data', 
-                 reload: bool = False) -> None:
+                 reload: bool = False,
+                 max_workers: int = 4) -> None:
         """
         Initialize F1 data fetcher.
         
@@ -22,11 +33,13 @@ class F1DataFetcher:
             cache_dir: Directory for FastF1 cache
             output_dir: Directory for output CSV files
             reload: If True, reload data 
+            max_workers: Number of processes loading sessions in parallel
         """
         
         self.cache_dir = Path(cache_dir)
         self.output_dir = Path(output_dir)
         self.reload = reload
+        self.max_workers = max_workers
 
         # Create directories with parent directories if needed
         self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -129,7 +142,8 @@ class F1DataFetcher:
     
     def _get_schedule(self, year: int, max_retries: int = 3, delay: int = 5) -> pd.DataFrame | None:
         """
-        Get event schedule with retry logic.
+        Get event schedule with retry logic. Schedules of past seasons
+        don't change, so they are stored in the cache directory and reused.
         
         Args:
             year: Year to fetch schedule for
@@ -137,9 +151,19 @@ class F1DataFetcher:
             delay: Delay between retries in seconds
             
         Returns:
-            DataFrame of schedule or None if failed
+            DataFrame with the 'EventName' column of the schedule or None if failed.
+            Only the event names are used, so both fresh and cached schedules are
+            returned as that plain DataFrame
         """
 
+        schedule_file = self.cache_dir / f'schedule_{year}.parquet'
+        past_season = year < datetime.now().year
+
+        # Skip the network call if a past season's schedule is already saved
+        if past_season and schedule_file.exists():
+            return pd.read_parquet(schedule_file, columns=['EventName'])
+
+        schedule = None
         for attempt in range(max_retries):
             try:
                 schedule = fastf1.get_event_schedule(year)
@@ -148,8 +172,8 @@ class F1DataFetcher:
                 schedule = schedule[schedule['EventFormat'] != 'testing']
                 if datetime.now().year == year:
                     schedule = schedule[schedule['EventDate'] < datetime.now()]
-                
-                return schedule
+                schedule = pd.DataFrame(schedule[['EventName']])
+                break
                 
             except Exception as e:
                 if attempt < max_retries - 1:
@@ -161,6 +185,20 @@ class F1DataFetcher:
                 else:
                     self.logger.error(f"Failed to get {year} schedule: {str(e)}")
                     return None
+
+        if schedule is None:
+            self.logger.error(f"Failed to get {year} schedule: no attempts made (max_retries={max_retries})")
+            return None
+
+        # Caching is best effort, a failed write doesn't make the fetch a failure.
+        # Only the event names are kept, the per-event local session times don't survive Arrow's conversion
+        if past_season:
+            try:
+                schedule.to_parquet(schedule_file)
+            except Exception as e:
+                self.logger.warning(f"Could not cache {year} schedule: {str(e)}")
+        
+        return schedule
     
     def _process_year_events(self, year: int, schedule: pd.DataFrame) -> list[pd.DataFrame]:
         """
@@ -176,39 +214,86 @@ class F1DataFetcher:
 
         yearly_data = []
 
-        for _, event in schedule.iterrows():
-            try:
-                time.sleep(5)  # attempt at rate limiting 
-                
-                session = fastf1.get_session(year, event['EventName'], 'Q')
-                session.load()
-
-                laps = session.laps 
-                weather_data = session.weather_data
-
-                # Determine if session is wet based on rainfall 
-                is_wet = False
-                if weather_data is not None and 'Rainfall' in weather_data.columns:
-                    session_weather = weather_data  
-                    if not session_weather.empty:
-                        rain_percentage = session_weather['Rainfall'].mean()
-                        is_wet = rain_percentage > 0.5
-
-                # get relevant columns from session.results
-                results_data = session.results[['DriverNumber', 'BroadcastName', 'TeamName', 
-                                          'Position', 'Q1', 'Q2', 'Q3']].copy()
-            
-                # Add event and weather information
-                results_data['Year'] = year
-                results_data['EventName'] = event['EventName']
-                results_data['WetSession'] = is_wet
-            
-                yearly_data.append(results_data)
+        # Workers share one lock and timestamp so requests stay spaced out across processes
+        rate_lock = multiprocessing.Lock()
+        last_request = multiprocessing.Value('d', 0.0, lock=False)
 
-            except Exception as e:
-                self.logger.error(f"Error loading {event['EventName']} {year}: {str(e)}")
+        with ProcessPoolExecutor(max_workers=self.max_workers,
+                                 initializer=_init_worker,
+                                 initargs=(str(self.cache_dir), rate_lock, last_request)) as executor:
+            # (name, future) pairs rather than a dict, so a repeated event name keeps its own result
+            futures = [(event_name, executor.submit(_process_one_event, year, event_name))
+                       for event_name in schedule['EventName']]
+
+            # Collect in schedule order
+            for event_name, future in futures:
+                try:
+                    yearly_data.append(future.result())
+                except Exception as e:
+                    self.logger.error(f"Error loading {event_name} {year}: {str(e)}")
 
         return yearly_data
+
+
+def _init_worker(cache_dir: str, rate_lock, last_request) -> None:
+    """
+    Set up a worker process for loading sessions.
+
+    Args:
+        cache_dir: Directory for FastF1 cache
+        rate_lock: Lock shared by all workers for rate limiting
+        last_request: Shared time of the most recent session request
+    """
+
+    global _rate_lock, _last_request
+    fastf1.Cache.enable_cache(cache_dir)
+    _rate_lock = rate_lock
+    _last_request = last_request
+
+def _process_one_event(year: int, event_name: str) -> pd.DataFrame:
+    """
+    Load a single qualifying session and extract its results.
+
+    Args:
+        year: Year of the event
+        event_name: Name of the event
+
+    Returns:
+        DataFrame containing the session results
+    """
+
+    # attempt at rate limiting, one request every REQUEST_INTERVAL seconds across all workers
+    # (skipped when called outside the pool, where no limiter has been set up)
+    if _rate_lock is not None and _last_request is not None:
+        with _rate_lock:
+            wait = _last_request.value + REQUEST_INTERVAL - time.time()
+            if wait > 0:
+                time.sleep(wait)
+            _last_request.value = time.time()
+
+    session = fastf1.get_session(year, event_name, 'Q')
+    # only results and weather are used, skip laps, telemetry and race control messages
+    session.load(laps=False, telemetry=False, weather=True, messages=False)
+
+    weather_data = session.weather_data
+
+    # Determine if session is wet based on rainfall 
+    is_wet = False
+    if weather_data is not None and 'Rainfall' in weather_data.columns:
+        rainfall = weather_data['Rainfall'].to_numpy()
+        is_wet = np.count_nonzero(rainfall) > 0.5 * rainfall.size
+
+    # get relevant columns from session.results
+    results_data = session.results[['DriverNumber', 'BroadcastName', 'TeamName', 
+                              'Position', 'Q1', 'Q2', 'Q3']].copy()
+
+    # Add event and weather information
+    results_data['Year'] = year
+    results_data['EventName'] = event_name
+    results_data['WetSession'] = is_wet
+
+    return results_data
+
 def main() -> None:
     """Main function to run the F1 data fetcher."""
 
@@ -221,13 +306,16 @@ def main() -> None:
                       help='Directory for output files')
     parser.add_argument('--reload', type=bool, default= False,
                       help='Reload existing data')
+    parser.add_argument('--max-workers', type=int, default=4,
+                      help='Number of processes loading sessions in parallel')
     
     args = parser.parse_args()
     
     fetcher = F1DataFetcher(
         cache_dir=args.cache_dir,
         output_dir=args.output_dir,
-        reload=args.reload
+        reload=args.reload,
+        max_workers=args.max_workers
     )
     
     results = fetcher.fetch_qualifying_data(args.years)
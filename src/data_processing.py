@@ -1,12 +1,52 @@
 from pathlib import Path
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pv
 import logging
+import os
+import re
 import argparse 
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+import orjson
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Columns read from the qualifying results CSVs and their types
+COLUMN_TYPES = {
+    'DriverNumber': pa.int16(), 'BroadcastName': pa.string(), 'TeamName': pa.string(),
+    'Position': pa.float64(), 'Q1': pa.string(), 'Q2': pa.string(), 'Q3': pa.string(),
+    'Year': pa.int16(), 'EventName': pa.string(), 'WetSession': pa.bool_()
+}
+# Arrow CSV parsing: multi-threaded within each file, typed and projected to COLUMN_TYPES, empty cells as null.
+# A column missing from a file comes back as typed nulls instead of failing the whole file
+CSV_READ_OPTIONS = pv.ReadOptions(use_threads=True)
+CSV_CONVERT_OPTIONS = pv.ConvertOptions(column_types=COLUMN_TYPES, include_columns=list(COLUMN_TYPES), 
+                                        include_missing_columns=True, strings_can_be_null=True)
+# Low-cardinality name columns used as group keys
+CATEGORY_COLUMNS = ['BroadcastName', 'TeamName', 'EventName']
+# Qualifying times as written by pandas ('0 days 00:01:22.824000') or as lap times ('1:22.824')
+TIME_PATTERN = re.compile(r'^(?:(\d+) days )?(?:(\d+):)?(\d+):(\d+)(?:\.(\d+))?$')
+
+
+def read_csv_file(file: Path) -> pa.Table | None:
+    """
+    Read one qualifying results CSV into an Arrow table.
+    
+    Args:
+        file: Path to the CSV file
+        
+    Returns:
+        Table with the columns in COLUMN_TYPES or None if the file couldn't be read
+    """
+
+    try:
+        return pv.read_csv(file, read_options=CSV_READ_OPTIONS, convert_options=CSV_CONVERT_OPTIONS)
+    except Exception as e:
+        print(f"Error reading {file.name}: {str(e)}")
+        return None
 
 def combine_csv_files(folder_path: str | Path) -> pd.DataFrame | None:
     """
@@ -23,24 +63,32 @@ def combine_csv_files(folder_path: str | Path) -> pd.DataFrame | None:
     """
 
     path = Path(folder_path)
-    all_dfs = []
+    files = sorted(path.glob('*.csv'))
     
-    for file in path.glob('*.csv'):
-        try:
-            df = pd.read_csv(file)
-            all_dfs.append(df)
-            print(f"Successfully read: {file.name}")
-        except Exception as e:
-            print(f"Error reading {file.name}: {str(e)}")
-    
-    if all_dfs:
-        combined_df = pd.concat(all_dfs, ignore_index=True)
-        print(f"\nTotal number of files combined: {len(all_dfs)}")
-        print(f"Total rows in DataFrame: {len(combined_df)}")
-        return combined_df
-    else:
+    if not files:
         print("No CSV files found in the specified folder!")
         return None
+    
+    # Files are parsed concurrently, Arrow's CSV reader releases the GIL; map keeps them in file order
+    with ThreadPoolExecutor(max_workers=min(8, len(files))) as executor:
+        results = list(executor.map(read_csv_file, files))
+    
+    tables = []
+    for file, table in zip(files, results):
+        if table is not None:
+            tables.append(table)
+            print(f"Successfully read: {file.name}")
+    
+    if not tables:
+        print("No CSV files could be read!")
+        return None
+    
+    # Columns are concatenated without copying before a single conversion to pandas
+    combined_df = pa.concat_tables(tables).to_pandas(categories=CATEGORY_COLUMNS)
+    
+    print(f"\nTotal number of files combined: {len(tables)}")
+    print(f"Total rows in DataFrame: {len(combined_df)}")
+    return combined_df
 
 def convert_time(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -53,55 +101,54 @@ def convert_time(df: pd.DataFrame) -> pd.DataFrame:
         DataFrame with converted time columns
     """
 
-    df['Q1'] = pd.to_timedelta(df['Q1'])
-    df['Q2'] = pd.to_timedelta(df['Q2'])
-    df['Q3'] = pd.to_timedelta(df['Q3'])
+    # Parse each distinct time string once, then map the results back onto the columns
+    raw_times = pd.Series(pd.concat([df['Q1'], df['Q2'], df['Q3']]).dropna().unique())
+    
+    # Times have a fixed layout, so pull out the fields with one regex and do integer maths in nanoseconds
+    parts = raw_times.str.extract(TIME_PATTERN)
+    days, hours, minutes, seconds = (parts[i].fillna('0').astype(np.int64).to_numpy() for i in range(4))
+    fraction_ns = parts[4].fillna('').str.ljust(9, '0').str[:9].astype(np.int64).to_numpy()
+    total_ns = (((days * 24 + hours) * 60 + minutes) * 60 + seconds) * 1_000_000_000 + fraction_ns
+    
+    # Strings that don't match the layout become NaT, report them so bad input isn't silently dropped
+    unmatched = parts[2].isna().to_numpy()
+    if unmatched.any():
+        logger.warning(f"{unmatched.sum()} qualifying time value(s) could not be parsed and were set to NaT, "
+                       f"e.g. {raw_times[unmatched].head(5).tolist()}")
+    parsed_times = pd.Series(pd.to_timedelta(total_ns, unit='ns'), index=raw_times.to_numpy()).where(~unmatched)
 
-    df['Q1Seconds'] = df['Q1'].apply(lambda x: x.total_seconds() if pd.notna(x) else np.nan)
-    df['Q2Seconds'] = df['Q2'].apply(lambda x: x.total_seconds() if pd.notna(x) else np.nan)
-    df['Q3Seconds'] = df['Q3'].apply(lambda x: x.total_seconds() if pd.notna(x) else np.nan)   
+    for col in ['Q1', 'Q2', 'Q3']:
+        # Look up by reindexing so the column stays timedelta64[ns] even when there was nothing to parse
+        df[col] = parsed_times.reindex(df[col]).to_numpy()
+        # vectorized over the whole column, NaT becomes NaN
+        df[f'{col}Seconds'] = df[col].dt.total_seconds()
     
     return df 
 
-def get_best_time(driver_data: pd.Series) -> float | None:
+def calculate_pole_gaps(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Get best qualifying time from Q1, Q2, or Q3.
+    Add best time, pole time and gap to pole columns for every row.
 
     Args:
-        driver_data: Series containing driver's qualifying times
+        df: DataFrame with Q1Seconds, Q2Seconds, Q3Seconds and Position columns
         
     Returns:
-        Best qualifying time or None if no valid times
-    """
-
-    if pd.notna(driver_data.get('Q3Seconds')):
-        return driver_data['Q3Seconds']
-    elif pd.notna(driver_data.get('Q2Seconds')):
-        return driver_data['Q2Seconds']
-    elif pd.notna(driver_data.get('Q1Seconds')):
-        return driver_data['Q1Seconds']
-    return None
-
-def calculate_gap_to_pole(position: float, best_time: float | None, pole_time: float) -> float:
+        DataFrame with BestTime, PoleTime and GapToPole columns
     """
-    Calculate gap to pole position.
 
-    Args:
-        position: Qualifying position
-        best_time: Driver's best qualifying time
-        pole_time: Pole position time
-        
-    Returns:
-        Gap to pole in seconds
-    """
-
-    if pd.isna(position):
-        return np.nan
-    elif position == 1:
-        return 0.0
-    elif best_time is None or pd.isna(pole_time):
-        return np.nan
-    return best_time - pole_time
+    # Best time is the latest session the driver set a time in, picked in one pass over the three columns
+    q1, q2, q3 = (df[f'{col}Seconds'].to_numpy() for col in ['Q1', 'Q2', 'Q3'])
+    df['BestTime'] = np.where(~np.isnan(q3), q3, np.where(~np.isnan(q2), q2, q1))
+    
+    # Pole time is the Q3 time of the driver classified first in each event
+    pole_times = df['Q3Seconds'].where(df['Position'] == 1)
+    df['PoleTime'] = pole_times.groupby([df['Year'], df['EventName']], sort=False, observed=True).transform('first')
+    
+    # Pole sitter is 0 by definition, unclassified drivers have no gap
+    gaps = (df['BestTime'] - df['PoleTime']).where(df['Position'] != 1, 0.0)
+    df['GapToPole'] = gaps.where(df['Position'].notna())
+    
+    return df
 
 def create_event_summary(event_name: str, position: float, gap_to_pole: float, teammate_gap: float) -> dict:
     """
@@ -122,7 +169,8 @@ def create_event_summary(event_name: str, position: float, gap_to_pole: float, t
         'position': position,
         'gapToPole': gap_to_pole,
         'teammateGap': teammate_gap,
-        'hasTeammateData': not pd.isna(teammate_gap)
+        # gaps are plain floats, NaN is the only value not equal to itself
+        'hasTeammateData': teammate_gap == teammate_gap
     }
 
 def create_driver_entry(year: int, driver: str, team: str) -> dict:
@@ -142,46 +190,29 @@ def create_driver_entry(year: int, driver: str, team: str) -> dict:
         'year': year,
         'driver': driver,
         'team': team,
-        'events': [],
-        'positions': [],
-        'gapToPole_values': [],
-        'teammateGap_values': [],
-        'completeDataCount': 0,
-        'totalEvents': 0
+        'events': []
     }
 
-def calculate_teammate_gaps(team_data: pd.DataFrame) -> dict[str, float]:
+def calculate_teammate_gaps(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Calculate gaps between teammates.
+    Add the gap to teammate for every row.
     
     Args:
-        team_data: DataFrame containing team qualifying data
+        df: DataFrame with BestTime column
         
     Returns:
-        Dictionary mapping driver names to time gaps with teammates
+        DataFrame with TeammateGap column, NaN unless the team ran exactly two drivers with times
     """
     
-    drivers = team_data['BroadcastName'].unique()
-    gaps: dict = {driver: np.nan for driver in drivers}
+    teams = df.groupby(['Year', 'EventName', 'TeamName'], sort=False, observed=True)['BestTime']
     
-    if len(drivers) == 2:
-        driver1, driver2 = drivers
-        driver1_data = team_data[team_data['BroadcastName'] == driver1]
-        driver2_data = team_data[team_data['BroadcastName'] == driver2]
-        
-        if not driver1_data.empty and not driver2_data.empty:
-            time1 = get_best_time(driver1_data.iloc[0])
-            time2 = get_best_time(driver2_data.iloc[0])
-
-            if time1 is not None and time2 is not None:
-                gaps.update({
-                    driver1: time1 - time2,
-                    driver2: time2 - time1
-                })
+    # For a pair of teammates 2 * own - (own + other) leaves own - other
+    gaps = 2 * df['BestTime'] - teams.transform('sum')
+    df['TeammateGap'] = gaps.where((teams.transform('size') == 2) & (teams.transform('count') == 2))
     
-    return gaps
+    return df
 
-def process_qualifying_data(quali_data: pd.DataFrame) -> list[dict]:
+def process_qualifying_data(quali_data: pd.DataFrame) -> Iterator[dict]:
     """
     Process qualifying data to create a timeline of driver performances.
     
@@ -189,14 +220,14 @@ def process_qualifying_data(quali_data: pd.DataFrame) -> list[dict]:
         quali_data: DataFrame containing qualifying session data
         
     Returns:
-        List of dictionaries containing processed data for each driver's season
+        Iterator over dictionaries containing processed data for each driver's season. Validation and 
+        the whole-frame calculations run before this returns; the per-season entries are built lazily
         
     Raises:
         ValueError: If required columns are missing from the input DataFrame
     """
 
     logger.info("Processing qualifying data...")
-    timeline_data: list = []
     
     required_columns = [
         'DriverNumber', 'BroadcastName', 'TeamName', 'Position', 
@@ -208,84 +239,64 @@ def process_qualifying_data(quali_data: pd.DataFrame) -> list[dict]:
     if missing_columns:
         raise ValueError(f"Missing required columns: {missing_columns}")
     
+    quali_data = calculate_pole_gaps(quali_data)
+    quali_data = calculate_teammate_gaps(quali_data)
+    
+    # Each driver's first row per event; teammate gaps only count for the team they started the season with
+    event_rows = quali_data.dropna(subset=['EventName', 'BroadcastName']).drop_duplicates(['Year', 'EventName', 'BroadcastName'])
+    season_teams = event_rows.groupby(['Year', 'BroadcastName'], sort=False, observed=True)['TeamName'].transform('first')
+    event_rows = event_rows.assign(TeammateGap=event_rows['TeammateGap'].where(event_rows['TeamName'] == season_teams))
+    
+    # Season statistics for every driver in one pass, NaN values are skipped by mean and count
+    season_stats = event_rows.groupby(['Year', 'BroadcastName'], sort=False, observed=True).agg(
+        avgQualifyingPosition=('Position', 'mean'),
+        avgGapToPole=('GapToPole', 'mean'),
+        avgTeammateGap=('TeammateGap', 'mean'),
+        completeDataCount=('TeammateGap', 'count')
+    )
+    events_per_year = event_rows.groupby('Year')['EventName'].nunique()
+    total_events = events_per_year.reindex(season_stats.index.get_level_values('Year')).to_numpy()
+    season_stats['dataCompleteness'] = season_stats['completeDataCount'] / total_events
+    season_stats = season_stats.drop(columns='completeDataCount').to_dict('index')
     
-    driver_team_mapping = {}
-    for year in quali_data['Year'].unique():
-        year_data = quali_data[quali_data['Year'] == year]
-        for _, row in year_data.iterrows():
-            key = (year, row['BroadcastName'])
-            if key not in driver_team_mapping:
-                driver_team_mapping[key] = row['TeamName']
+    return iter_driver_seasons(event_rows, season_stats)
 
-    for year in quali_data['Year'].unique():
-        logger.info(f"Processing year: {year}")
-        year_data = quali_data[quali_data['Year'] == year]
+def iter_driver_seasons(event_rows: pd.DataFrame, season_stats: dict) -> Iterator[dict]:
+    """
+    Build each driver's season entry from the prepared event rows, one season at a time.
+    
+    Args:
+        event_rows: One row per (year, event, driver) with Position, GapToPole and TeammateGap columns
+        season_stats: Season statistics keyed by (year, driver)
         
-        all_events = year_data['EventName'].unique()
+    Yields:
+        Dictionary containing processed data for one driver's season
+    """
+
+    for year, year_data in event_rows.groupby('Year', sort=False):
+        logger.info(f"Processing year: {year}")
         
-        year_drivers = set(year_data['BroadcastName'].unique())
+        # Scatter the season into driver x event grids by integer code, events in order of first appearance.
+        # Missing (driver, event) cells stay NaN, which is what a non-participation summary holds.
+        driver_ids, drivers = pd.factorize(year_data['BroadcastName'])
+        event_ids, events = pd.factorize(year_data['EventName'])
+        grids = {}
+        for col in ['Position', 'GapToPole', 'TeammateGap']:
+            grid = np.full((len(drivers), len(events)), np.nan)
+            grid[driver_ids, event_ids] = year_data[col].to_numpy()
+            grids[col] = grid.tolist()
         
-        for driver in year_drivers:
-            team = driver_team_mapping.get((year, driver))
-            if team is None:
-                continue
-                
+        # Drivers in order of first appearance, same as the grid rows; the team is the first one seen that season
+        first_rows = year_data.drop_duplicates('BroadcastName')[['BroadcastName', 'TeamName']]
+        for driver_id, (driver, team) in enumerate(first_rows.itertuples(index=False, name=None)):
             driver_entry = create_driver_entry(year, driver, team)
-            timeline_data.append(driver_entry)
-            
-            # Process each event for this driver
-            for event_name in all_events:
-                event_data = year_data[year_data['EventName'] == event_name]
-                
-                # Get pole time for the event
-                pole_data = event_data[event_data['Position'] == 1]
-                pole_time = pole_data.iloc[0]['Q3Seconds'] if not pole_data.empty else np.nan
-                
-                # Get driver's data for this event
-                driver_event_data = event_data[event_data['BroadcastName'] == driver]
-                
-                if driver_event_data.empty:
-                    # Driver didn't participate in this event
-                    event_summary = create_event_summary(event_name, np.nan, np.nan, np.nan)
-                else:
-                    # Calculate gaps with teammates
-                    team_data = event_data[event_data['TeamName'] == team]
-                    gaps = calculate_teammate_gaps(team_data)
-                    
-                    driver_data = driver_event_data.iloc[0]
-                    best_time = get_best_time(driver_data)
-                    qualifying_position = driver_data['Position'] if pd.notna(driver_data['Position']) else np.nan
-                    
-                    gap_to_pole = calculate_gap_to_pole(qualifying_position, best_time, pole_time)
-                    event_summary = create_event_summary(event_name, qualifying_position, gap_to_pole, gaps.get(driver, np.nan))
-                    
-                    if not pd.isna(gap_to_pole):
-                        driver_entry['gapToPole_values'].append(gap_to_pole)
-                    if not pd.isna(gaps.get(driver)):
-                        driver_entry['teammateGap_values'].append(gaps[driver])
-                        driver_entry['completeDataCount'] += 1
-                
-                driver_entry['events'].append(event_summary)
-                driver_entry['positions'].append(event_summary['position'])
-                driver_entry['totalEvents'] += 1
-    
-    # Calculate final statistics
-    for entry in timeline_data:
-        valid_positions = [pos for pos in entry['positions'] if not pd.isna(pos)]
-        valid_gaps_to_pole = [gap for gap in entry['gapToPole_values'] if not pd.isna(gap)]
-        valid_teammate_gaps = [gap for gap in entry['teammateGap_values'] if not pd.isna(gap)]
-        
-        entry['avgQualifyingPosition'] = np.mean(valid_positions) if valid_positions else np.nan
-        entry['avgGapToPole'] = np.mean(valid_gaps_to_pole) if valid_gaps_to_pole else np.nan
-        entry['avgTeammateGap'] = np.mean(valid_teammate_gaps) if valid_teammate_gaps else np.nan
-        entry['dataCompleteness'] = entry['completeDataCount'] / entry['totalEvents'] if entry['totalEvents'] > 0 else 0
-        
-        # Clean up 
-        for key in ['positions', 'gapToPole_values', 'teammateGap_values', 
-                   'completeDataCount', 'totalEvents']:
-            del entry[key]
-    
-    return timeline_data
+            driver_entry['events'] = [
+                create_event_summary(event_name, position, gap_to_pole, teammate_gap)
+                for event_name, position, gap_to_pole, teammate_gap in zip(
+                    events, grids['Position'][driver_id], grids['GapToPole'][driver_id], grids['TeammateGap'][driver_id])
+            ]
+            driver_entry.update(season_stats[(year, driver)])
+            yield driver_entry
 
 def generate_dashboard_data(data_folder: str | Path, output_file: str | Path) -> None:
     """
@@ -307,7 +318,23 @@ def generate_dashboard_data(data_folder: str | Path, output_file: str | Path) ->
     
     output_path = Path(output_file)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    pd.DataFrame(career_timeline_data).to_json(output_path, orient='records', indent=4)
+    
+    # Write the records array one entry at a time as they're produced, rather than holding the whole timeline.
+    # orjson handles the numpy scalars and writes NaN as null. The array goes to a temporary file next to the
+    # output and only replaces it once complete, so a failure part way leaves the previous file intact
+    tmp_path = output_path.with_name(f'.{output_path.name}.tmp')
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(b'[\n')
+            for i, entry in enumerate(career_timeline_data):
+                if i > 0:
+                    f.write(b',\n')
+                f.write(orjson.dumps(entry, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+            f.write(b'\n]\n')
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
 def main() -> None:
     """Main function to process F1 qualifying data and generate dashboard."""